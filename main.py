@@ -9,7 +9,7 @@ Pipeline stages:
 2. Download PDFs to .data/pdfs
 3. Extract text from PDFs to .data/texts
 4. Extract structured fields using LLM to .data/extracted
-5. Aggregate to Excel/CSV in .data/
+5. Aggregate to Excel/CSV/Parquet in .data/
 """
 
 import logging
@@ -20,7 +20,7 @@ from pathlib import Path
 from src.config import config
 
 # Import all pipeline modules
-from src.fetch_links import fetch_report_links, fetch_pdf_urls
+from src.fetch_links import fetch_report_links, collect_all_threaded
 from src.download_pdfs import download_pdfs
 from src.extract_text import extract_texts_from_directory
 from src.extract_fields import process_text_files
@@ -35,6 +35,8 @@ def run_pipeline(
     llm_model: str | None = None,
     skip_download: bool = False,
     skip_extraction: bool = False,
+    cache_dir: str | None = None,
+    force: bool = False,
 ):
     """
     Run the complete AAIB data collection pipeline.
@@ -45,6 +47,8 @@ def run_pipeline(
         llm_model: Which OpenAI model to use if use_llm=True (default: from config.OPENAI_MODEL)
         skip_download: Skip PDF download (use existing PDFs)
         skip_extraction: Skip text extraction (use existing text files)
+        cache_dir: Directory for cached LLM responses (default: <config.EXTRACTED_DIR>/.cache)
+        force: Re-run field extraction even for reports whose output is up to date
     """
     # Use config defaults if not specified
     if num_reports is None:
@@ -56,50 +60,52 @@ def run_pipeline(
     logging.info("AAIB REPORT COLLECTOR - PIPELINE START")
     logging.info("=" * 70)
     logging.info("Configuration:")
-    logging.info(f"  Reports to process: {num_reports}")
-    logging.info(f"  Use LLM: {use_llm} (model: {llm_model if use_llm else 'N/A'})")
+    logging.info("  Reports to process: %s", num_reports)
+    logging.info("  Use LLM: %s (model: %s)", use_llm, llm_model if use_llm else "N/A")
     logging.info(
-        f"  OpenAI API Key: {'✓ Set' if config.has_openai_key() else '✗ Not set'}"
+        "  OpenAI API Key: %s", "✓ Set" if config.has_openai_key() else "✗ Not set"
     )
-    logging.info(f"  Skip download: {skip_download}")
-    logging.info(f"  Skip extraction: {skip_extraction}")
+    logging.info("  Skip download: %s", skip_download)
+    logging.info("  Skip extraction: %s", skip_extraction)
     logging.info("=" * 70)
 
-    # Stage 1: Fetch report links
-    logging.info("\n[STAGE 1/5] Fetching report links from GOV.UK API...")
-    report_links = fetch_report_links(num_reports)
-    logging.info(f"Found {len(report_links)} report links")
-
-    if not report_links:
-        logging.error("No report links found. Exiting.")
-        return
-
-    # Stage 2: Fetch PDF URLs and download PDFs
+    # Stages 1 and 2 overlap: PDF URLs are fetched for each report as soon as
+    # its search page arrives, rather than after every page has been fetched
     if not skip_download:
-        logging.info("\n[STAGE 2/5] Fetching PDF URLs and downloading...")
-        pdf_urls = []
-        for i, report in enumerate(report_links, 1):
-            logging.info(
-                f"Fetching PDFs for report {i}/{len(report_links)}: {report['link']}"
-            )
-            urls = fetch_pdf_urls(report["link"])
-            pdf_urls.extend(urls)
-
-        logging.info(f"Found {len(pdf_urls)} PDF URLs")
-
+        logging.info(
+            "\n[STAGE 1/5] Fetching report links and PDF URLs from GOV.UK API..."
+        )
+        pdf_urls, num_links = collect_all_threaded(fetch_report_links(num_reports))
+        logging.info("Found %s report links", num_links)
+
+        if not num_links:
+            logging.error("No report links found. Exiting.")
+            return
+
+        # The same bulletin PDF is often attached to several reports
+        unique_pdf_urls = list(dict.fromkeys(pdf_urls))
+        logging.info(
+            "Found %s PDF URLs (%s duplicates removed)",
+            len(unique_pdf_urls),
+            len(pdf_urls) - len(unique_pdf_urls),
+        )
+        pdf_urls = unique_pdf_urls
+
+        logging.info("\n[STAGE 2/5] Downloading PDFs...")
         if pdf_urls:
             downloaded_files = download_pdfs(pdf_urls)
-            logging.info(f"Downloaded {len(downloaded_files)} PDFs")
+            logging.info("Downloaded %s PDFs", len(downloaded_files))
         else:
             logging.warning("No PDF URLs found")
     else:
+        logging.info("\n[STAGE 1/5] Skipping report links (no download)")
         logging.info("\n[STAGE 2/5] Skipping PDF download (using existing files)")
 
     # Stage 3: Extract text from PDFs
     if not skip_extraction:
         logging.info("\n[STAGE 3/5] Extracting text from PDFs...")
         text_results = extract_texts_from_directory()
-        logging.info(f"Extracted text from {len(text_results)} PDFs")
+        logging.info("Extracted text from %s PDFs", len(text_results))
     else:
         logging.info("\n[STAGE 3/5] Skipping text extraction (using existing files)")
 
@@ -110,25 +116,28 @@ def run_pipeline(
     else:
         logging.info("Using DUMMY extractor (no API calls)")
 
-    extracted_records = process_text_files(use_llm=use_llm, model=llm_model)
-    logging.info(f"Extracted fields from {len(extracted_records)} reports")
+    extracted_records = process_text_files(
+        use_llm=use_llm, model=llm_model, cache_dir=cache_dir, force=force
+    )
+    logging.info("Extracted fields from %s reports", len(extracted_records))
 
-    # Stage 5: Aggregate to Excel/CSV
-    logging.info("\n[STAGE 5/5] Aggregating data to Excel/CSV...")
+    # Stage 5: Aggregate to Excel/CSV/Parquet
+    logging.info("\n[STAGE 5/5] Aggregating data to Excel/CSV/Parquet...")
     df = aggregate_data()
 
     # Final summary
     logging.info("\n" + "=" * 70)
     logging.info("PIPELINE COMPLETE!")
     logging.info("=" * 70)
-    logging.info(f"Total reports processed: {len(df) if not df.empty else 0}")
+    logging.info("Total reports processed: %s", len(df) if not df.empty else 0)
     logging.info("Output files:")
-    logging.info(f"  - {config.OUTPUT_EXCEL}")
-    logging.info(f"  - {config.OUTPUT_CSV}")
+    logging.info("  - %s", config.OUTPUT_EXCEL)
+    logging.info("  - %s", config.OUTPUT_CSV)
+    logging.info("  - %s", config.OUTPUT_PARQUET)
     logging.info("Intermediate data:")
-    logging.info(f"  - {config.PDFS_DIR}/       (downloaded PDFs)")
-    logging.info(f"  - {config.TEXTS_DIR}/      (extracted text JSON files)")
-    logging.info(f"  - {config.EXTRACTED_DIR}/  (structured field JSON files)")
+    logging.info("  - %s/       (downloaded PDFs)", config.PDFS_DIR)
+    logging.info("  - %s/      (extracted text and metadata files)", config.TEXTS_DIR)
+    logging.info("  - %s/  (structured field JSON files)", config.EXTRACTED_DIR)
     logging.info("=" * 70)
 
 
@@ -190,6 +199,19 @@ Examples:
         help=f"Skip text extraction stage (use existing text files in {config.TEXTS_DIR})",
     )
 
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help=f"Directory for cached LLM responses (default: {config.EXTRACTED_DIR}/.cache)",
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run field extraction even if extracted output is newer than its text file",
+    )
+
     args = parser.parse_args()
 
     # Run the pipeline
@@ -199,6 +221,8 @@ Examples:
         llm_model=args.llm_model,
         skip_download=args.skip_download,
         skip_extraction=args.skip_extraction,
+        cache_dir=args.cache_dir,
+        force=args.force,
     )
 
 
@@ -1,5 +1,6 @@
-import json
 import logging
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
 from config import config
@@ -7,6 +8,15 @@ from config import config
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
 
+def _load_json_file(json_file: Path) -> dict | None:
+    """Read and parse one extracted field file, or None if it cannot be loaded."""
+    try:
+        return orjson.loads(json_file.read_bytes())
+    except Exception as e:
+        logging.error("Error loading %s: %s", json_file, e)
+        return None
+
+
 def load_extracted_fields(extracted_dir: str | None = None) -> list[dict]:
     """
     Load all extracted field JSON files from directory.
@@ -23,23 +33,23 @@ def load_extracted_fields(extracted_dir: str | None = None) -> list[dict]:
     extracted_path = Path(extracted_dir)
 
     if not extracted_path.exists():
-        logging.error(f"Extracted data directory does not exist: {extracted_path}")
+        logging.error("Extracted data directory does not exist: %s", extracted_path)
         return []
 
     json_files = list(extracted_path.glob("*_extracted.json"))
-    logging.info(f"Found {len(json_files)} extracted field files in {extracted_path}")
-
-    records = []
-
-    for json_file in json_files:
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                records.append(data)
-        except Exception as e:
-            logging.error(f"Error loading {json_file}: {e}")
-
-    logging.info(f"Loaded {len(records)} records")
+    logging.info(
+        "Found %s extracted field files in %s", len(json_files), extracted_path
+    )
+
+    # Small-file reads are I/O bound, so load them concurrently
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        records = [
+            data
+            for data in executor.map(_load_json_file, json_files)
+            if data is not None
+        ]
+
+    logging.info("Loaded %s records", len(records))
     return records
 
 
@@ -70,18 +80,21 @@ def aggregate_to_dataframe(records: list[dict]) -> pd.DataFrame:
         "text_length",
     ]
 
-    # Create DataFrame
-    df = pd.DataFrame(records)
+    # Create DataFrame with the expected columns, in order (missing ones are null)
+    df = pd.DataFrame.from_records(records, columns=columns)
 
-    # Ensure all expected columns exist
+    # Compact column types for export
     for col in columns:
-        if col not in df.columns:
-            df[col] = None
+        if col != "text_length":
+            df[col] = df[col].astype("string")
+    df["text_length"] = pd.to_numeric(df["text_length"], downcast="integer")
 
-    # Reorder columns
-    df = df[columns]
+    # Arrow-backed columns: compact in memory and written natively to Parquet
+    df = df.convert_dtypes(dtype_backend="pyarrow")
 
-    logging.info(f"Created DataFrame with {len(df)} rows and {len(df.columns)} columns")
+    logging.info(
+        "Created DataFrame with %s rows and %s columns", len(df), len(df.columns)
+    )
     return df
 
 
@@ -100,10 +113,17 @@ def export_to_excel(df: pd.DataFrame, output_file: str | None = None) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        df.to_excel(output_path, index=False, engine="openpyxl")
-        logging.info(f"Exported {len(df)} records to Excel: {output_path}")
+        # to_excel writes column by column, which xlsxwriter's constant_memory mode
+        # (rows in order only) would silently drop, so the workbook stays in memory
+        with pd.ExcelWriter(
+            output_path,
+            engine="xlsxwriter",
+            engine_kwargs={"options": {"strings_to_urls": False}},
+        ) as writer:
+            df.to_excel(writer, index=False, sheet_name="reports")
+        logging.info("Exported %s records to Excel: %s", len(df), output_path)
     except Exception as e:
-        logging.error(f"Error exporting to Excel: {e}")
+        logging.error("Error exporting to Excel: %s", e)
 
 
 def export_to_csv(df: pd.DataFrame, output_file: str | None = None) -> None:
@@ -121,16 +141,38 @@ def export_to_csv(df: pd.DataFrame, output_file: str | None = None) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        df.to_csv(output_path, index=False, encoding="utf-8")
-        logging.info(f"Exported {len(df)} records to CSV: {output_path}")
+        df.to_csv(output_path, index=False, encoding="utf-8", lineterminator="\n")
+        logging.info("Exported %s records to CSV: %s", len(df), output_path)
+    except Exception as e:
+        logging.error("Error exporting to CSV: %s", e)
+
+
+def export_to_parquet(df: pd.DataFrame, output_file: str | None = None) -> None:
+    """
+    Export DataFrame to Parquet file.
+
+    Args:
+        df: pandas DataFrame to export
+        output_file: Path to output Parquet file (default: from config.OUTPUT_PARQUET)
+    """
+    if output_file is None:
+        output_file = config.OUTPUT_PARQUET
+
+    output_path = Path(output_file)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        df.to_parquet(output_path, engine="pyarrow", compression="snappy", index=False)
+        logging.info("Exported %s records to Parquet: %s", len(df), output_path)
     except Exception as e:
-        logging.error(f"Error exporting to CSV: {e}")
+        logging.error("Error exporting to Parquet: %s", e)
 
 
 def aggregate_data(
     extracted_dir: str | None = None,
     output_excel: str | None = None,
     output_csv: str | None = None,
+    output_parquet: str | None = None,
 ) -> pd.DataFrame:
     """
     Main aggregation function: load extracted fields, create DataFrame, and export.
@@ -139,6 +181,7 @@ def aggregate_data(
         extracted_dir: Directory containing extracted field JSON files (default: from config.EXTRACTED_DIR)
         output_excel: Path to output Excel file (default: from config.OUTPUT_EXCEL)
         output_csv: Path to output CSV file (default: from config.OUTPUT_CSV)
+        output_parquet: Path to output Parquet file (default: from config.OUTPUT_PARQUET)
 
     Returns:
         pandas DataFrame with aggregated data
@@ -155,9 +198,10 @@ def aggregate_data(
     # Create DataFrame
     df = aggregate_to_dataframe(records)
 
-    # Export to both formats
+    # Export to all formats
     export_to_excel(df, output_excel)
     export_to_csv(df, output_csv)
+    export_to_parquet(df, output_parquet)
 
     logging.info("Data aggregation complete!")
     return df
@@ -168,8 +212,8 @@ if __name__ == "__main__":
     df = aggregate_data()
 
     if not df.empty:
-        logging.info(f"\nDataFrame summary:")
-        logging.info(f"  Shape: {df.shape}")
-        logging.info(f"  Columns: {list(df.columns)}")
-        logging.info(f"\nFirst few records:")
+        logging.info("\nDataFrame summary:")
+        logging.info("  Shape: %s", df.shape)
+        logging.info("  Columns: %s", list(df.columns))
+        logging.info("\nFirst few records:")
         print(df.head().to_string())
@@ -30,6 +30,11 @@ class Config:
     EXTRACTED_DIR: str = os.getenv("EXTRACTED_DIR", ".data/extracted")
     OUTPUT_EXCEL: str = os.getenv("OUTPUT_EXCEL", ".data/aaib_reports.xlsx")
     OUTPUT_CSV: str = os.getenv("OUTPUT_CSV", ".data/aaib_reports.csv")
+    OUTPUT_PARQUET: str = os.getenv("OUTPUT_PARQUET", ".data/aaib_reports.parquet")
+
+    # GOV.UK content API cache (seconds before a cached response is revalidated)
+    CONTENT_CACHE_DIR: str = os.getenv("CONTENT_CACHE_DIR", ".data/cache/content")
+    CONTENT_CACHE_TTL: int = int(os.getenv("CONTENT_CACHE_TTL", "86400"))
 
     @classmethod
     def has_openai_key(cls) -> bool:
@@ -50,6 +55,8 @@ Configuration Summary:
   Extracted Directory: {cls.EXTRACTED_DIR}
   Output Excel: {cls.OUTPUT_EXCEL}
   Output CSV: {cls.OUTPUT_CSV}
+  Output Parquet: {cls.OUTPUT_PARQUET}
+  Content Cache Directory: {cls.CONTENT_CACHE_DIR}
         """.strip()
 
 
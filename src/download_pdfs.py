@@ -1,19 +1,104 @@
-import requests
+import asyncio
 import logging
+import os
 from pathlib import Path
-import time
+import aiofiles
+import aiohttp
+import orjson
+from tenacity import AsyncRetrying, RetryError, stop_after_attempt, wait_fixed
 from config import config
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
+# Concurrency limits for the shared download session. All PDFs come from one
+# host, so in-flight downloads match its connection limit rather than queueing
+# for a pooled connection
+MAX_CONNECTIONS = 32
+MAX_CONNECTIONS_PER_HOST = 8
+MAX_CONCURRENT_DOWNLOADS = MAX_CONNECTIONS_PER_HOST
 
-def download_pdf(
-    url: str, output_dir: Path, retry_delay: int = 3, max_retries: int = 3
+# Per-socket timeouts only: a total timeout would also count time spent waiting
+# for a connection and cut off large PDFs that are still streaming
+CONNECT_TIMEOUT = 30
+READ_TIMEOUT = 60
+
+# Large chunks keep the write loop short; writes this size bypass the file buffer
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Record of URLs already downloaded into the output directory (one JSON object per line)
+MANIFEST_FILENAME = "pdfs.jsonl"
+
+
+def load_manifest(output_dir: Path) -> dict[str, dict]:
+    """
+    Load the download manifest for an output directory.
+
+    Args:
+        output_dir: Directory the PDFs are saved to
+
+    Returns:
+        Mapping of PDF URL to its manifest entry (filename and, if recorded, size)
+    """
+    manifest_path = output_dir / MANIFEST_FILENAME
+    if not manifest_path.exists():
+        return {}
+
+    manifest = {}
+    with open(manifest_path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = orjson.loads(line)
+                manifest[entry["url"]] = entry
+            except Exception as e:
+                logging.warning(
+                    "Skipping bad manifest line in %s: %s", manifest_path, e
+                )
+    return manifest
+
+
+def _append_to_manifest(output_dir: Path, downloads: list[tuple[str, Path]]) -> None:
+    """Record newly downloaded URLs in the manifest."""
+    if not downloads:
+        return
+    with open(output_dir / MANIFEST_FILENAME, "ab") as f:
+        for url, path in downloads:
+            entry = {"url": url, "filename": path.name, "size": path.stat().st_size}
+            f.write(orjson.dumps(entry) + b"\n")
+
+
+def _matches_manifest(path: Path, entry: dict) -> bool:
+    """Whether a manifest entry's file is still on disk at its recorded size."""
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return False
+    return entry.get("size") is None or size == entry["size"]
+
+
+def _pdf_filename(url: str) -> str:
+    """Name a PDF is saved under, taken from the last segment of its URL."""
+    filename = url.split("/")[-1]
+    if not filename.endswith(".pdf"):
+        filename += ".pdf"
+    return filename
+
+
+async def download_pdf(
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+    url: str,
+    output_dir: Path,
+    retry_delay: int = 3,
+    max_retries: int = 3,
 ) -> Path | None:
     """
     Download a single PDF from the given URL to the output directory.
 
     Args:
+        session: Shared aiohttp session (keeps connections alive between downloads)
+        sem: Semaphore bounding the number of in-flight downloads
         url: The PDF URL to download
         output_dir: Directory to save the PDF
         retry_delay: Seconds to wait between retries
@@ -22,45 +107,94 @@ def download_pdf(
     Returns:
         Path to the downloaded PDF, or None if download failed
     """
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    # Extract filename from URL
-    filename = url.split("/")[-1]
-    if not filename.endswith(".pdf"):
-        filename += ".pdf"
-
+    filename = _pdf_filename(url)
     output_path = output_dir / filename
+    # Written beside the target and moved into place once complete, so the
+    # target path only ever holds a whole file
+    part_path = output_dir / (filename + ".part")
 
     # Skip if already downloaded
     if output_path.exists():
-        logging.info(f"Already exists: {filename}")
+        logging.info("Already exists: %s", filename)
         return output_path
 
     # Retry logic
-    for attempt in range(max_retries):
-        try:
-            logging.info(f"Downloading: {url}")
-            response = requests.get(url, timeout=60, stream=True)
-            response.raise_for_status()
-
-            # Write in chunks for large files
-            with open(output_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            logging.info(f"Saved: {output_path}")
-            return output_path
-
-        except Exception as e:
-            logging.error(
-                f"Error downloading {url} (attempt {attempt + 1}/{max_retries}): {e}"
+    try:
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(max_retries),
+            wait=wait_fixed(retry_delay),
+        ):
+            with attempt:
+                attempt_number = attempt.retry_state.attempt_number
+                try:
+                    async with sem:
+                        logging.info("Downloading: %s", url)
+                        async with session.get(url) as response:
+                            response.raise_for_status()
+
+                            # Write in chunks for large files
+                            async with aiofiles.open(part_path, "wb") as f:
+                                async for chunk in response.content.iter_chunked(
+                                    DOWNLOAD_CHUNK_SIZE
+                                ):
+                                    await f.write(chunk)
+                    os.replace(part_path, output_path)
+                except Exception as e:
+                    logging.error(
+                        "Error downloading %s (attempt %s/%s): %s",
+                        url,
+                        attempt_number,
+                        max_retries,
+                        e,
+                    )
+                    if attempt_number < max_retries:
+                        logging.info("Retrying in %s seconds...", retry_delay)
+                    raise
+
+    except RetryError:
+        logging.error("Failed to download %s after %s attempts", url, max_retries)
+        return None
+    finally:
+        # Also reached on cancellation (e.g. Ctrl-C), which is not an Exception
+        part_path.unlink(missing_ok=True)
+
+    logging.info("Saved: %s", output_path)
+    return output_path
+
+
+async def _download_all(pdf_urls: list[str], output_path: Path) -> list[Path | None]:
+    """
+    Download all URLs concurrently over a single pooled session.
+
+    URLs that would save to the same filename are not downloaded side by side;
+    only the first one is fetched and the rest come back as None.
+    """
+    owners = {}
+    for url in pdf_urls:
+        owner = owners.setdefault(_pdf_filename(url), url)
+        if owner != url:
+            logging.warning(
+                "Skipping %s, its filename is already used by %s", url, owner
             )
-            if attempt < max_retries - 1:
-                logging.info(f"Retrying in {retry_delay} seconds...")
-                time.sleep(retry_delay)
-            else:
-                logging.error(f"Failed to download {url} after {max_retries} attempts")
-                return None
+
+    sem = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=30,
+        ttl_dns_cache=300,
+    )
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(
+            total=None, sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT
+        ),
+    ) as session:
+        downloads = {
+            url: download_pdf(session, sem, url, output_path) for url in owners.values()
+        }
+        results = dict(zip(downloads, await asyncio.gather(*downloads.values())))
+    return [results.get(url) for url in pdf_urls]
 
 
 def download_pdfs(pdf_urls: list[str], output_dir: str | None = None) -> list[Path]:
@@ -78,18 +212,49 @@ def download_pdfs(pdf_urls: list[str], output_dir: str | None = None) -> list[Pa
         output_dir = config.PDFS_DIR
 
     output_path = Path(output_dir)
-    downloaded_files = []
+    output_path.mkdir(parents=True, exist_ok=True)
 
-    logging.info(f"Starting download of {len(pdf_urls)} PDFs to {output_path}")
+    # URLs recorded in the manifest were downloaded by an earlier run; their
+    # files are still checked, so deleted or truncated PDFs are fetched again
+    manifest = load_manifest(output_path)
+    # Each filename belongs to one URL, so a file is never recorded for two
+    filename_owners = {entry["filename"]: url for url, entry in manifest.items()}
+    known_files = []
+    new_urls = []
+    for url in pdf_urls:
+        entry = manifest.get(url)
+        if entry is None:
+            owner = filename_owners.get(_pdf_filename(url))
+            if owner is None:
+                new_urls.append(url)
+            else:
+                logging.warning(
+                    "Skipping %s, its filename is already used by %s", url, owner
+                )
+            continue
+        path = output_path / entry["filename"]
+        if _matches_manifest(path, entry):
+            known_files.append(path)
+        else:
+            logging.warning("Re-downloading %s, %s is missing or incomplete", url, path)
+            path.unlink(missing_ok=True)
+            new_urls.append(url)
 
-    for i, url in enumerate(pdf_urls, 1):
-        logging.info(f"[{i}/{len(pdf_urls)}] Processing: {url}")
-        result = download_pdf(url, output_path)
-        if result:
-            downloaded_files.append(result)
+    logging.info(
+        "Starting download of %s PDFs to %s (%s already in manifest)",
+        len(new_urls),
+        output_path,
+        len(known_files),
+    )
+
+    results = asyncio.run(_download_all(new_urls, output_path))
+    _append_to_manifest(
+        output_path, [(url, path) for url, path in zip(new_urls, results) if path]
+    )
+    downloaded_files = known_files + [path for path in results if path]
 
     logging.info(
-        f"Download complete: {len(downloaded_files)}/{len(pdf_urls)} successful"
+        "Download complete: %s/%s successful", len(downloaded_files), len(pdf_urls)
     )
     return downloaded_files
 
@@ -101,6 +266,6 @@ if __name__ == "__main__":
     ]
 
     downloaded = download_pdfs(test_urls)
-    logging.info(f"Downloaded {len(downloaded)} files:")
+    logging.info("Downloaded %s files:", len(downloaded))
     for path in downloaded:
-        logging.info(f"  {path}")
+        logging.info("  %s", path)
@@ -1,13 +1,28 @@
+import asyncio
+import hashlib
+import io
 import json
 import logging
+import os
+import re
+import orjson
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI
 from config import config
+from extract_text import LEGACY_TEXT_SUFFIX, TEXT_META_SUFFIX, TEXT_SUFFIX
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
-# Extraction prompt for the LLM
-EXTRACTION_PROMPT = """You are an expert aviation safety analyst. Extract key information from this AAIB aircraft accident report.
+# Static system prompt for the LLM. It is sent first and never changes between
+# reports, so OpenAI's automatic prompt caching can reuse it once it is longer
+# than the 1024-token caching threshold; the report text goes in the user message.
+EXTRACTION_PROMPT_SYSTEM = """You are an expert aviation safety analyst. You extract structured data from UK Air Accidents Investigation Branch (AAIB) aircraft accident and serious incident reports.
+
+The user message contains the text of one AAIB report, extracted from its PDF. Extract the key information from it.
 
 Return ONLY valid JSON with these exact fields (use null for missing data):
 {
@@ -20,20 +35,279 @@ Return ONLY valid JSON with these exact fields (use null for missing data):
   "cause": "Primary cause or contributing factors"
 }
 
-Report text:
+About the input:
+- The text was extracted page by page from a PDF. Expect page headers and footers (for example "AAIB Bulletin: 3/2024", "© Crown copyright 2024", page numbers), broken lines, hyphenated words split across lines and tables flattened into lines of text. Ignore this noise.
+- The text may be truncated. Only use what is present; never guess values that are not supported by the text.
+- Most reports start with a factual summary table with labels such as "Aircraft Type and Registration:", "No & Type of Engines:", "Year of Manufacture:", "Date & Time (UTC):", "Location:", "Type of Flight:", "Persons on Board:", "Injuries:", "Nature of Damage:", "Commander's Licence:", "Commander's Age:", "Commander's Flying Experience:" and "Information Source:". Prefer values from this table when it is present.
+- Longer reports (Field Investigations and formal Aircraft Accident Reports) contain sections such as "Synopsis", "History of the flight", "Analysis", "Conclusion", "Findings", "Causal factors", "Contributory factors" and "Safety actions" or "Safety Recommendations".
+- A document may be a bulletin or collection covering several occurrences. In that case extract the first occurrence described in detail.
+
+Field rules:
+- title: Use the report's own heading if there is one (usually the aircraft type and registration, or a short description of the event). Otherwise write a short descriptive title such as "Runway excursion on landing, Piper PA-28-161, G-ABCD". Keep it under 100 characters.
+- date: The date of the occurrence itself, not the publication date of the bulletin and not the date of the investigation. Convert to YYYY-MM-DD. Dates in the factual table often look like "12 March 2023 at 1435 hrs". If only the month and year are known, use YYYY-MM. If no date is given, use null.
+- aircraft_type: Manufacturer and model as written in the report, for example "Cessna 152", "Robinson R44 II" or "Airbus A320-214". Do not include the registration. If more than one aircraft was involved (for example a mid-air collision), list them separated by "; " in the same order as the registrations.
+- registration: The aircraft registration mark exactly as written, including the nationality prefix and hyphen, for example "G-ABCD", "EI-ABC" or "N123AB". For more than one aircraft, separate with "; ". Use null for unregistered aircraft such as some drones or microlights without a registration mark.
+- location: The place where the occurrence happened, as specific as the report allows: an aerodrome name (for example "Gloucestershire Airport"), a nearby town with county, or a position description such as "5 nm south-east of Shoreham". Do not include coordinates unless nothing else is given.
+- summary: One or two plain sentences describing what happened and the outcome, including injuries and damage when they are stated. Write in the past tense and do not speculate beyond the report.
+- cause: The primary cause and the main contributing factors as stated by the AAIB, taken from the "Conclusion", "Causal factors", "Contributory factors" or "Analysis" sections when present. Summarise in one or two sentences. If the report states that the cause could not be determined, say so. If the report gives no cause at all (for example a short record-only report), use null.
+
+Output rules:
+- Return a single JSON object with exactly the seven keys above and no others.
+- All values must be strings or null. Do not return numbers, lists or nested objects.
+- Do not wrap the JSON in Markdown code fences and do not add any commentary before or after it.
+- Use British English spelling, as the reports do.
+
+Example of a valid response:
+{
+  "title": "Piper PA-28-161 Warrior II, G-ABCD",
+  "date": "2023-03-12",
+  "aircraft_type": "Piper PA-28-161 Warrior II",
+  "registration": "G-ABCD",
+  "location": "Gloucestershire Airport",
+  "summary": "During a training flight the aircraft bounced on landing and the nose landing gear collapsed. The two occupants were uninjured; the propeller and engine were damaged.",
+  "cause": "The instructor did not take control in time to recover from a bounced landing flown by the student at too high an airspeed."
+}
 """
 
+# Bump whenever EXTRACTION_PROMPT_SYSTEM or the request shape changes so that
+# previously cached LLM responses are no longer reused
+PROMPT_VERSION = "v2"
+
+# Only the start of each report is sent to the LLM
+MAX_TEXT_CHARS = 20000
+
+# Use the OpenAI Batch API when at least this many reports need the LLM;
+# smaller runs send concurrent chat requests instead
+BATCH_THRESHOLD = 20
+BATCH_POLL_INTERVAL = 30
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+MAX_CONCURRENT_REQUESTS = 8
+
+# First non-blank line of a text, matched in place without copying the rest
+_FIRST_LINE_RE = re.compile(r"\s*([^\n]*)")
+
+FIELD_NAMES = [
+    "title",
+    "date",
+    "aircraft_type",
+    "registration",
+    "location",
+    "summary",
+    "cause",
+]
+
+
+def _cache_key(model: str, text: str) -> str:
+    """Content-addressable cache key for an LLM request (length-prefixed parts)."""
+    h = hashlib.sha256()
+    for part in (PROMPT_VERSION, model, text):
+        encoded = part.encode("utf-8")
+        h.update(len(encoded).to_bytes(8, "big"))
+        h.update(encoded)
+    return h.hexdigest()
+
+
+def _load_cached_response(cache_file: Path) -> dict | None:
+    """Return the cached LLM response, or None on a miss or unreadable entry."""
+    if not cache_file.exists():
+        return None
+    try:
+        with open(cache_file, "rb") as f:
+            return orjson.loads(f.read())["response"]
+    except Exception as e:
+        logging.warning("Ignoring unreadable cache entry %s: %s", cache_file, e)
+        return None
+
+
+def _save_cached_response(cache_file: Path, model: str, response: dict) -> None:
+    """Atomically write an LLM response to the cache."""
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "model": model,
+        "prompt_version": PROMPT_VERSION,
+        "response": response,
+    }
+    tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(orjson.dumps(entry, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_file, cache_file)
+
+
+def _truncate(text: str) -> str:
+    """Truncate text if too long (keep first ~20k chars for context)."""
+    return text[:MAX_TEXT_CHARS] if len(text) > MAX_TEXT_CHARS else text
+
+
+def _report_stem(text_file: Path) -> str:
+    """Report name shared by a text file and its extracted output."""
+    for suffix in (TEXT_META_SUFFIX, LEGACY_TEXT_SUFFIX):
+        if text_file.name.endswith(suffix):
+            return text_file.name[: -len(suffix)]
+    return text_file.stem
+
+
+def _find_text_files(text_path: Path) -> list[Path]:
+    """Text metadata files, plus legacy single-file sidecars without a newer pair."""
+    meta_files = list(text_path.glob(f"*{TEXT_META_SUFFIX}"))
+    stems = {_report_stem(meta_file) for meta_file in meta_files}
+    legacy_files = [
+        legacy_file
+        for legacy_file in text_path.glob(f"*{LEGACY_TEXT_SUFFIX}")
+        if _report_stem(legacy_file) not in stems
+    ]
+    return meta_files + legacy_files
+
+
+def _read_report_text(text_file: Path, first_line_only: bool) -> tuple[dict, str, int]:
+    """
+    Read a report's metadata and only as much of its text as is needed.
+
+    Args:
+        text_file: Metadata file (or legacy single-file JSON sidecar)
+        first_line_only: Read just the first non-blank line instead of MAX_TEXT_CHARS
+
+    Returns:
+        Tuple of (metadata, text, full text length)
+    """
+    metadata = orjson.loads(text_file.read_bytes())
+
+    # Older versions stored the whole text inside the JSON sidecar
+    if text_file.name.endswith(LEGACY_TEXT_SUFFIX):
+        text = metadata.get("text", "")
+        return metadata, text, len(text)
+
+    raw_text_file = text_file.with_name(_report_stem(text_file) + TEXT_SUFFIX)
+    with open(raw_text_file, "r", encoding="utf-8") as f:
+        if first_line_only:
+            text = next((line for line in f if line.strip()), "")
+        else:
+            text = f.read(MAX_TEXT_CHARS)
+
+    return metadata, text, metadata.get("text_length", len(text))
+
+
+def _chat_request(model: str, truncated_text: str) -> dict:
+    """Build the chat.completions request body for one report."""
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": EXTRACTION_PROMPT_SYSTEM},
+            {"role": "user", "content": f"Report text:\n{truncated_text}"},
+        ],
+        "temperature": 0.1,
+        "response_format": {"type": "json_object"},
+    }
+
+
+# Shared OpenAI client so every request reuses the same HTTP connection pool
+_CLIENT: OpenAI | None = None
+_CLIENT_API_KEY: str | None = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _get_client(api_key: str) -> OpenAI:
+    """Return the shared OpenAI client, creating it on first use."""
+    global _CLIENT, _CLIENT_API_KEY
+    with _CLIENT_LOCK:
+        if _CLIENT is None or _CLIENT_API_KEY != api_key:
+            _CLIENT = OpenAI(
+                api_key=api_key,
+                http_client=httpx.Client(
+                    limits=httpx.Limits(
+                        max_keepalive_connections=20, max_connections=40
+                    ),
+                    timeout=60,
+                ),
+            )
+            _CLIENT_API_KEY = api_key
+        return _CLIENT
+
+
+def _failed_fields(error: Exception | str) -> dict:
+    """Empty field set returned when extraction fails."""
+    result = {field: None for field in FIELD_NAMES}
+    result["error"] = str(error)
+    return result
+
+
+def _resolve_cache_dir(cache_dir: str | None) -> Path:
+    if cache_dir is None:
+        return Path(config.EXTRACTED_DIR) / ".cache"
+    return Path(cache_dir)
+
+
+def _cache_file(cache_dir: str | None, model: str, truncated_text: str) -> Path:
+    return _resolve_cache_dir(cache_dir) / f"{_cache_key(model, truncated_text)}.json"
+
+
+def _batch_state_file(cache_dir: str | None, cache_files: list[Path]) -> Path:
+    """
+    File recording the Batch API job submitted for a set of requests.
+
+    Keyed by the requests' cache keys in order, so a later run with the same
+    pending requests finds the batch again and the custom_id indexes still match.
+    """
+    h = hashlib.sha256()
+    for cache_file in cache_files:
+        h.update(cache_file.stem.encode("ascii"))
+    return _resolve_cache_dir(cache_dir) / "batches" / f"{h.hexdigest()}.json"
+
+
+def _save_batch_state(state_file: Path, batch_id: str, num_requests: int) -> None:
+    """Atomically record a submitted batch so an interrupted run can resume it."""
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "batch_id": batch_id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "num_requests": num_requests,
+    }
+    tmp_file = state_file.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(orjson.dumps(entry, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_file, state_file)
+
+
+def _resume_batch(client: OpenAI, state_file: Path):
+    """Batch an earlier run submitted for the same requests, or None to submit anew."""
+    if not state_file.exists():
+        return None
+    try:
+        batch_id = orjson.loads(state_file.read_bytes())["batch_id"]
+        batch = client.batches.retrieve(batch_id)
+    except Exception as e:
+        logging.warning("Could not resume batch from %s: %s", state_file, e)
+        return None
+    if batch.status in BATCH_FINAL_STATUSES and not batch.output_file_id:
+        return None
+    logging.info("Resuming batch %s (status: %s)", batch.id, batch.status)
+    return batch
+
+
+def _store_result(cache_file: Path, model: str, result: dict) -> None:
+    try:
+        _save_cached_response(cache_file, model, result)
+    except OSError as e:
+        logging.warning("Could not write cache entry %s: %s", cache_file, e)
+
 
 def extract_fields_with_llm(
-    text: str, model: str | None = None, api_key: str | None = None
+    text: str,
+    model: str | None = None,
+    api_key: str | None = None,
+    cache_dir: str | None = None,
 ) -> dict:
     """
     Extract structured fields from report text using OpenAI API.
 
+    Responses are cached on disk, keyed by prompt version, model and text, so
+    re-running on unchanged input does not call the API again.
+
     Args:
         text: The report text to analyze
         model: OpenAI model to use (default: from config.OPENAI_MODEL)
         api_key: OpenAI API key (default: from config.OPENAI_API_KEY)
+        cache_dir: Directory for cached LLM responses (default: <config.EXTRACTED_DIR>/.cache)
 
     Returns:
         Dictionary with extracted fields
@@ -43,46 +317,225 @@ def extract_fields_with_llm(
     if api_key is None:
         api_key = config.OPENAI_API_KEY
 
-    try:
-        # Initialize OpenAI client
-        client = OpenAI(api_key=api_key)
+    truncated_text = _truncate(text)
 
-        # Truncate text if too long (keep first ~20k chars for context)
-        truncated_text = text[:20000] if len(text) > 20000 else text
+    cache_file = _cache_file(cache_dir, model, truncated_text)
+    cached = _load_cached_response(cache_file)
+    if cached is not None:
+        logging.info("Using cached LLM response: %s", cache_file.name)
+        return cached
 
-        logging.info(f"Sending {len(truncated_text)} chars to {model}...")
+    try:
+        client = _get_client(api_key)
+
+        logging.info("Sending %s chars to %s...", len(truncated_text), model)
 
         # Call OpenAI API
         response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert at extracting structured data from aviation accident reports.",
-                },
-                {"role": "user", "content": EXTRACTION_PROMPT + truncated_text},
-            ],
-            temperature=0.1,
-            response_format={"type": "json_object"},
+            **_chat_request(model, truncated_text)
         )
 
         # Parse response
         result = json.loads(response.choices[0].message.content)
-        logging.info(f"Successfully extracted fields: {list(result.keys())}")
+        logging.info("Successfully extracted fields: %s", list(result.keys()))
+
+        _store_result(cache_file, model, result)
         return result
 
     except Exception as e:
-        logging.error(f"Error during LLM extraction: {e}")
-        return {
-            "title": None,
-            "date": None,
-            "aircraft_type": None,
-            "registration": None,
-            "location": None,
-            "summary": None,
-            "cause": None,
-            "error": str(e),
-        }
+        logging.error("Error during LLM extraction: %s", e)
+        return _failed_fields(e)
+
+
+async def _extract_concurrently(
+    truncated_texts: list[str], model: str, api_key: str
+) -> list[dict]:
+    """Send one chat request per text, at most MAX_CONCURRENT_REQUESTS at a time."""
+    client = AsyncOpenAI(api_key=api_key)
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def extract_one(truncated_text: str) -> dict:
+        async with sem:
+            try:
+                logging.info("Sending %s chars to %s...", len(truncated_text), model)
+                response = await client.chat.completions.create(
+                    **_chat_request(model, truncated_text)
+                )
+                return json.loads(response.choices[0].message.content)
+            except Exception as e:
+                logging.error("Error during LLM extraction: %s", e)
+                return _failed_fields(e)
+
+    try:
+        return await asyncio.gather(*[extract_one(t) for t in truncated_texts])
+    finally:
+        await client.close()
+
+
+def _extract_with_batch_api(
+    truncated_texts: list[str], model: str, api_key: str, state_file: Path
+) -> list[dict]:
+    """
+    Run all requests through the OpenAI Batch API and wait for the results.
+
+    The batch id is kept in state_file until its output has been downloaded, so
+    a run interrupted while waiting resumes the same batch instead of paying
+    for a new one.
+    """
+    client = _get_client(api_key)
+
+    lines = [
+        orjson.dumps(
+            {
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": _chat_request(model, truncated_text),
+            }
+        )
+        for i, truncated_text in enumerate(truncated_texts)
+    ]
+    batch_input = io.BytesIO(b"\n".join(lines))
+
+    try:
+        batch = _resume_batch(client, state_file)
+        if batch is None:
+            input_file = client.files.create(
+                file=("aaib_batch_input.jsonl", batch_input), purpose="batch"
+            )
+            batch = client.batches.create(
+                input_file_id=input_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            _save_batch_state(state_file, batch.id, len(lines))
+            logging.info("Submitted batch %s with %s requests", batch.id, len(lines))
+
+        while batch.status not in BATCH_FINAL_STATUSES:
+            time.sleep(BATCH_POLL_INTERVAL)
+            batch = client.batches.retrieve(batch.id)
+            logging.info("Batch %s status: %s", batch.id, batch.status)
+
+        if not batch.output_file_id:
+            state_file.unlink(missing_ok=True)
+            raise RuntimeError(f"Batch {batch.id} finished with status {batch.status}")
+
+        output = client.files.content(batch.output_file_id).text
+        state_file.unlink(missing_ok=True)
+    except Exception as e:
+        logging.error("Error during batch LLM extraction: %s", e)
+        return [_failed_fields(e) for _ in truncated_texts]
+
+    results: list[dict] = [
+        _failed_fields("No result returned by batch") for _ in truncated_texts
+    ]
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            index = int(item["custom_id"])
+            if not 0 <= index < len(results):
+                raise IndexError(f"custom_id {index} out of range")
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            logging.error("Skipping malformed batch output line: %s", e)
+            continue
+        try:
+            if item.get("error"):
+                raise RuntimeError(item["error"])
+            body = item["response"]["body"]
+            results[index] = json.loads(body["choices"][0]["message"]["content"])
+        except Exception as e:
+            logging.error("Error in batch result %s: %s", item["custom_id"], e)
+            results[index] = _failed_fields(e)
+
+    return results
+
+
+def extract_fields_with_llm_batch(
+    texts: list[str],
+    model: str | None = None,
+    api_key: str | None = None,
+    cache_dir: str | None = None,
+) -> list[dict]:
+    """
+    Extract structured fields from many report texts using OpenAI API.
+
+    Cached responses are reused; the remaining texts go through the OpenAI
+    Batch API when there are at least BATCH_THRESHOLD of them, otherwise they
+    are sent as concurrent chat requests.
+
+    Args:
+        texts: The report texts to analyze
+        model: OpenAI model to use (default: from config.OPENAI_MODEL)
+        api_key: OpenAI API key (default: from config.OPENAI_API_KEY)
+        cache_dir: Directory for cached LLM responses (default: <config.EXTRACTED_DIR>/.cache)
+
+    Returns:
+        List of dictionaries with extracted fields, in the same order as texts
+    """
+    if model is None:
+        model = config.OPENAI_MODEL
+    if api_key is None:
+        api_key = config.OPENAI_API_KEY
+
+    results: list[dict | None] = [None] * len(texts)
+    pending = []
+
+    for i, text in enumerate(texts):
+        truncated_text = _truncate(text)
+        cache_file = _cache_file(cache_dir, model, truncated_text)
+        cached = _load_cached_response(cache_file)
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append((i, truncated_text, cache_file))
+
+    logging.info(
+        "LLM extraction: %s cached, %s to request",
+        len(texts) - len(pending),
+        len(pending),
+    )
+
+    if pending:
+        truncated_texts = [truncated_text for _, truncated_text, _ in pending]
+        if len(pending) >= BATCH_THRESHOLD:
+            state_file = _batch_state_file(
+                cache_dir, [cache_file for _, _, cache_file in pending]
+            )
+            extracted = _extract_with_batch_api(
+                truncated_texts, model, api_key, state_file
+            )
+        else:
+            extracted = asyncio.run(
+                _extract_concurrently(truncated_texts, model, api_key)
+            )
+
+        for (i, _, cache_file), result in zip(pending, extracted):
+            if "error" not in result:
+                _store_result(cache_file, model, result)
+            results[i] = result
+
+    return results
+
+
+def _extractor_info(use_llm: bool, model: str) -> dict:
+    """How a set of extracted fields was produced, stored alongside them."""
+    if not use_llm:
+        return {"mode": "dummy", "model": None, "prompt_version": None}
+    return {"mode": "llm", "model": model, "prompt_version": PROMPT_VERSION}
+
+
+def _load_reusable_output(output_file: Path, extractor: dict) -> dict | None:
+    """Existing output if it was produced the same way and did not fail, else None."""
+    try:
+        existing = orjson.loads(output_file.read_bytes())
+    except (OSError, orjson.JSONDecodeError) as e:
+        logging.warning("Re-extracting %s, bad output: %s", output_file.name, e)
+        return None
+    if "error" in existing or existing.get("extractor") != extractor:
+        return None
+    return existing
 
 
 def extract_fields_dummy(text: str) -> dict:
@@ -98,12 +551,11 @@ def extract_fields_dummy(text: str) -> dict:
     """
     logging.info("Using DUMMY extractor (no API calls)")
 
-    # Simple heuristic: extract first line as title
-    lines = text.strip().split("\n")
-    first_line = lines[0] if lines else "Unknown Report"
+    # Simple heuristic: extract first line as title (without scanning the rest)
+    first_line = _FIRST_LINE_RE.match(text).group(1).rstrip()[:100] or "Unknown Report"
 
     return {
-        "title": first_line[:100],
+        "title": first_line,
         "date": "2024-01-15",
         "aircraft_type": "Example Aircraft Type",
         "registration": "G-ABCD",
@@ -118,15 +570,23 @@ def process_text_files(
     output_dir: str | None = None,
     use_llm: bool = False,
     model: str | None = None,
+    cache_dir: str | None = None,
+    force: bool = False,
 ) -> list[dict]:
     """
-    Process all text JSON files and extract structured fields.
+    Process all extracted text files and extract structured fields.
+
+    Text files whose extracted output is already newer than the text file, and
+    was produced by the same extractor (mode, model and prompt version) without
+    an error, are skipped and their existing output reused, unless force=True.
 
     Args:
-        text_dir: Directory containing extracted text JSON files (default: from config.TEXTS_DIR)
+        text_dir: Directory containing extracted text files (default: from config.TEXTS_DIR)
         output_dir: Directory to save extracted field JSON files (default: from config.EXTRACTED_DIR)
         use_llm: Whether to use real LLM (True) or dummy extractor (False)
         model: Which OpenAI model to use if use_llm=True (default: from config.OPENAI_MODEL)
+        cache_dir: Directory for cached LLM responses (default: <config.EXTRACTED_DIR>/.cache)
+        force: Re-extract every file even if its output is up to date
 
     Returns:
         List of extracted records
@@ -143,48 +603,71 @@ def process_text_files(
     output_path.mkdir(parents=True, exist_ok=True)
 
     if not text_path.exists():
-        logging.error(f"Text directory does not exist: {text_path}")
+        logging.error("Text directory does not exist: %s", text_path)
         return []
 
-    text_files = list(text_path.glob("*_text.json"))
-    logging.info(f"Found {len(text_files)} text files in {text_path}")
+    text_files = _find_text_files(text_path)
+    logging.info("Found %s text files in %s", len(text_files), text_path)
 
     if use_llm and not config.has_openai_key():
         logging.warning("OPENAI_API_KEY not set! Falling back to dummy mode.")
         use_llm = False
 
-    results = []
-
-    for i, text_file in enumerate(text_files, 1):
-        logging.info(f"[{i}/{len(text_files)}] Processing: {text_file.name}")
+    extractor = _extractor_info(use_llm, model)
+    results_by_file = {}
+
+    # Load all texts first so LLM requests can be dispatched together
+    documents = []
+    for text_file in text_files:
+        output_file = output_path / f"{_report_stem(text_file)}_extracted.json"
+
+        # Reuse output that is newer than its source text and was produced the
+        # same way; failed extractions are always retried
+        if (
+            not force
+            and output_file.exists()
+            and output_file.stat().st_mtime >= text_file.stat().st_mtime
+        ):
+            existing = _load_reusable_output(output_file, extractor)
+            if existing is not None:
+                results_by_file[text_file] = existing
+                logging.info("Up to date, skipping: %s", text_file.name)
+                continue
+
+        documents.append(
+            (text_file, output_file, *_read_report_text(text_file, not use_llm))
+        )
 
-        # Load text data
-        with open(text_file, "r", encoding="utf-8") as f:
-            text_data = json.load(f)
+    texts = [text for _, _, _, text, _ in documents]
 
-        text = text_data.get("text", "")
+    # Extract fields
+    if use_llm:
+        extracted_fields = extract_fields_with_llm_batch(
+            texts, model=model, cache_dir=cache_dir
+        )
+    else:
+        extracted_fields = [extract_fields_dummy(text) for text in texts]
 
-        # Extract fields
-        if use_llm:
-            extracted = extract_fields_with_llm(text, model=model)
-        else:
-            extracted = extract_fields_dummy(text)
+    for i, ((text_file, output_file, metadata, _, text_length), extracted) in enumerate(
+        zip(documents, extracted_fields), 1
+    ):
+        logging.info("[%s/%s] Processing: %s", i, len(documents), text_file.name)
 
         # Add metadata
-        extracted["source_pdf"] = text_data.get("pdf_name")
-        extracted["text_length"] = len(text)
+        extracted["source_pdf"] = metadata.get("pdf_name")
+        extracted["text_length"] = text_length
+        extracted["extractor"] = extractor
 
         # Save extracted fields
-        output_filename = text_file.stem.replace("_text", "_extracted.json")
-        output_file = output_path / output_filename
+        with open(output_file, "wb") as f:
+            f.write(orjson.dumps(extracted, option=orjson.OPT_INDENT_2))
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(extracted, f, indent=2, ensure_ascii=False)
+        logging.info("Saved extracted fields to: %s", output_file)
+        results_by_file[text_file] = extracted
 
-        logging.info(f"Saved extracted fields to: {output_file}")
-        results.append(extracted)
+    results = [results_by_file[text_file] for text_file in text_files]
 
-    logging.info(f"Field extraction complete: {len(results)} reports processed")
+    logging.info("Field extraction complete: %s reports processed", len(results))
     return results
 
 
@@ -194,8 +677,8 @@ if __name__ == "__main__":
 
     results = process_text_files(use_llm=False)
 
-    logging.info(f"\nExtracted fields from {len(results)} reports:")
+    logging.info("\nExtracted fields from %s reports:", len(results))
     for result in results:
-        logging.info(f"  Title: {result.get('title', 'N/A')}")
-        logging.info(f"  Date: {result.get('date', 'N/A')}")
-        logging.info(f"  Aircraft: {result.get('aircraft_type', 'N/A')}")
+        logging.info("  Title: %s", result.get("title", "N/A"))
+        logging.info("  Date: %s", result.get("date", "N/A"))
+        logging.info("  Aircraft: %s", result.get("aircraft_type", "N/A"))
@@ -1,53 +1,154 @@
 import fitz  # PyMuPDF
+import hashlib
 import logging
+import itertools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-import json
+import orjson
 from config import config
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
+# Each PDF produces a small metadata sidecar plus the raw text, so readers that
+# only need the start of the text never have to parse the whole document
+TEXT_META_SUFFIX = "_text.meta.json"
+TEXT_SUFFIX = "_text.txt"
+LEGACY_TEXT_SUFFIX = "_text.json"
 
-def extract_text_from_pdf(pdf_path: Path) -> str:
+# Text extraction flags: keep PyMuPDF's plain-text defaults but never collect images
+TEXT_FLAGS = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_IMAGES
+
+# PDFs with at least this many pages are split into page ranges across workers;
+# below it, process start-up and re-opening the document cost more than they save
+PAGE_PARALLEL_THRESHOLD = 50
+
+
+def _page_count(pdf_path: Path) -> int:
+    """Number of pages in a PDF, or 0 if it cannot be opened."""
+    try:
+        with fitz.open(pdf_path, filetype="pdf") as doc:
+            return doc.page_count
+    except Exception:
+        return 0
+
+
+def _extract_page_range(pdf_path: Path, start: int, stop: int) -> str:
+    """Extract the text of pages [start, stop) of a PDF (runs in a worker process)."""
+    with fitz.open(pdf_path, filetype="pdf") as doc:
+        return "\n".join(
+            doc[page_num].get_text("text", flags=TEXT_FLAGS, sort=False)
+            for page_num in range(start, stop)
+        )
+
+
+def extract_text_from_pdf(
+    pdf_path: Path, executor: Executor | None = None, num_chunks: int = 1
+) -> tuple[Path, str]:
     """
     Extract all text from a PDF file using PyMuPDF.
 
+    Kept as a top-level function so it can be dispatched to worker processes.
+    When an executor is given and the PDF has at least PAGE_PARALLEL_THRESHOLD
+    pages, its pages are split into num_chunks ranges extracted in parallel.
+
     Args:
         pdf_path: Path to the PDF file
+        executor: Process pool to extract page ranges on (default: extract in-process)
+        num_chunks: Number of page ranges to split long PDFs into
 
     Returns:
-        Extracted text as a single string
+        Tuple of (pdf_path, extracted text as a single string)
     """
     try:
-        doc = fitz.open(pdf_path)
-        text_content = []
+        # filetype="pdf" skips MuPDF's format sniffing
+        doc = fitz.open(pdf_path, filetype="pdf")
+
+        if doc.needs_pass:
+            logging.warning("Skipping encrypted PDF: %s", pdf_path.name)
+            doc.close()
+            return pdf_path, ""
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text_content.append(page.get_text())
+        page_count = doc.page_count
 
-        doc.close()
+        if (
+            executor is not None
+            and num_chunks > 1
+            and page_count >= PAGE_PARALLEL_THRESHOLD
+        ):
+            doc.close()
+            chunk_size = -(-page_count // num_chunks)
+            starts = range(0, page_count, chunk_size)
+            stops = [min(start + chunk_size, page_count) for start in starts]
+            text_content = list(
+                executor.map(
+                    _extract_page_range, itertools.repeat(pdf_path), starts, stops
+                )
+            )
+        else:
+            # Plain text only: no image blocks, no reading-order sort
+            text_content = [
+                page.get_text("text", flags=TEXT_FLAGS, sort=False) for page in doc
+            ]
+            doc.close()
 
         full_text = "\n".join(text_content)
-        logging.info(f"Extracted {len(full_text)} characters from {pdf_path.name}")
-        return full_text
+        logging.info("Extracted %s characters from %s", len(full_text), pdf_path.name)
+        return pdf_path, full_text
 
     except Exception as e:
-        logging.error(f"Error extracting text from {pdf_path}: {e}")
-        return ""
+        logging.error("Error extracting text from %s: %s", pdf_path, e)
+        return pdf_path, ""
+
+
+def pdf_signature(pdf_path: Path) -> str:
+    """
+    Cheap content signature for a PDF: sha256 of its first 1 MiB plus its size.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        Hex digest identifying the PDF contents
+    """
+    h = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        h.update(f.read(1 << 20))
+    h.update(str(pdf_path.stat().st_size).encode())
+    return h.hexdigest()
+
+
+def _load_sidecar(meta_path: Path) -> dict | None:
+    """Load an existing text metadata sidecar, or None if missing or unreadable."""
+    if not meta_path.exists():
+        return None
+    try:
+        return orjson.loads(meta_path.read_bytes())
+    except orjson.JSONDecodeError:
+        return None
 
 
 def extract_texts_from_directory(
-    pdf_dir: str | None = None, output_dir: str | None = None
+    pdf_dir: str | None = None,
+    output_dir: str | None = None,
+    max_workers: int | None = None,
 ) -> list[dict]:
     """
-    Extract text from all PDFs in a directory and save as JSON sidecar files.
+    Extract text from all PDFs in a directory and save as sidecar files.
+
+    Each PDF gets a <stem>_text.meta.json file (pdf_name, pdf_path, signature,
+    text_length) and a <stem>_text.txt file with the raw UTF-8 text. PDFs are
+    extracted in parallel worker processes; sidecar files are written from the
+    main process. PDFs whose sidecar already records a matching content
+    signature are not extracted again.
 
     Args:
         pdf_dir: Directory containing PDF files (default: from config.PDFS_DIR)
-        output_dir: Directory to save extracted text JSON files (default: from config.TEXTS_DIR)
+        output_dir: Directory to save extracted text files (default: from config.TEXTS_DIR)
+        max_workers: Number of worker processes (default: os.cpu_count())
 
     Returns:
-        List of dicts with 'pdf_path', 'text_path', and 'text' keys
+        List of dicts with 'pdf_path', 'text_path', and 'text_length' keys
     """
     if pdf_dir is None:
         pdf_dir = config.PDFS_DIR
@@ -59,43 +160,105 @@ def extract_texts_from_directory(
     output_path.mkdir(parents=True, exist_ok=True)
 
     if not pdf_path.exists():
-        logging.error(f"PDF directory does not exist: {pdf_path}")
+        logging.error("PDF directory does not exist: %s", pdf_path)
         return []
 
     pdf_files = list(pdf_path.glob("*.pdf"))
-    logging.info(f"Found {len(pdf_files)} PDF files in {pdf_path}")
+    logging.info("Found %s PDF files in %s", len(pdf_files), pdf_path)
+
+    if max_workers is None:
+        max_workers = os.cpu_count()
 
     results = []
 
-    for i, pdf_file in enumerate(pdf_files, 1):
-        logging.info(f"[{i}/{len(pdf_files)}] Processing: {pdf_file.name}")
+    # Skip PDFs whose sidecar was written from identical contents
+    signatures = {}
+    to_extract = []
+    for pdf_file in pdf_files:
+        text_path = output_path / (pdf_file.stem + TEXT_SUFFIX)
+        signature = pdf_signature(pdf_file)
+        sidecar = _load_sidecar(output_path / (pdf_file.stem + TEXT_META_SUFFIX))
+        if (
+            sidecar
+            and sidecar.get("pdf_sha256_prefix") == signature
+            and text_path.exists()
+        ):
+            logging.info("Unchanged, skipping: %s", pdf_file.name)
+            results.append(
+                {
+                    "pdf_path": pdf_file,
+                    "text_path": text_path,
+                    "text_length": sidecar.get("text_length"),
+                }
+            )
+            continue
+        signatures[pdf_file] = signature
+        to_extract.append(pdf_file)
 
-        # Extract text
-        text = extract_text_from_pdf(pdf_file)
+    if not to_extract:
+        logging.info("Text extraction complete: %s files processed", len(results))
+        return results
 
-        if not text:
-            logging.warning(f"No text extracted from {pdf_file.name}")
-            continue
+    # Extract text in worker processes: one PDF per task, except long PDFs
+    # which are split into page ranges so a single file doesn't stall the run
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        page_counts = list(executor.map(_page_count, to_extract, chunksize=4))
+        short_pdfs = [
+            pdf_file
+            for pdf_file, page_count in zip(to_extract, page_counts)
+            if page_count < PAGE_PARALLEL_THRESHOLD
+        ]
+        long_pdfs = [
+            pdf_file
+            for pdf_file, page_count in zip(to_extract, page_counts)
+            if page_count >= PAGE_PARALLEL_THRESHOLD
+        ]
+
+        extracted = itertools.chain(
+            executor.map(extract_text_from_pdf, short_pdfs, chunksize=2),
+            (
+                extract_text_from_pdf(pdf_file, executor, max_workers)
+                for pdf_file in long_pdfs
+            ),
+        )
+
+        for i, (pdf_file, text) in enumerate(extracted, 1):
+            logging.info("[%s/%s] Processed: %s", i, len(to_extract), pdf_file.name)
+
+            if not text:
+                logging.warning("No text extracted from %s", pdf_file.name)
+                continue
+
+            # Save raw text first; the metadata file marks the pair as complete
+            text_path = output_path / (pdf_file.stem + TEXT_SUFFIX)
+            meta_path = output_path / (pdf_file.stem + TEXT_META_SUFFIX)
+
+            text_path.write_text(text, encoding="utf-8")
 
-        # Save as JSON sidecar file
-        text_filename = pdf_file.stem + "_text.json"
-        text_path = output_path / text_filename
+            meta = {
+                "pdf_name": pdf_file.name,
+                "pdf_path": str(pdf_file.absolute()),
+                "pdf_sha256_prefix": signatures[pdf_file],
+                "text_length": len(text),
+            }
 
-        data = {
-            "pdf_name": pdf_file.name,
-            "pdf_path": str(pdf_file.absolute()),
-            "text_length": len(text),
-            "text": text,
-        }
+            with open(meta_path, "wb") as f:
+                f.write(orjson.dumps(meta, option=orjson.OPT_INDENT_2))
 
-        with open(text_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            # Replace any single-file sidecar left by older versions
+            (output_path / (pdf_file.stem + LEGACY_TEXT_SUFFIX)).unlink(missing_ok=True)
 
-        logging.info(f"Saved text to: {text_path}")
+            logging.info("Saved text to: %s", text_path)
 
-        results.append({"pdf_path": pdf_file, "text_path": text_path, "text": text})
+            results.append(
+                {
+                    "pdf_path": pdf_file,
+                    "text_path": text_path,
+                    "text_length": len(text),
+                }
+            )
 
-    logging.info(f"Text extraction complete: {len(results)} files processed")
+    logging.info("Text extraction complete: %s files processed", len(results))
     return results
 
 
@@ -103,8 +266,11 @@ if __name__ == "__main__":
     # Extract text from all PDFs in .data/pdfs
     results = extract_texts_from_directory()
 
-    logging.info(f"Extracted text from {len(results)} PDFs")
+    logging.info("Extracted text from %s PDFs", len(results))
     for result in results:
         logging.info(
-            f"  {result['pdf_path'].name} -> {result['text_path'].name} ({len(result['text'])} chars)"
+            "  %s -> %s (%s chars)",
+            result["pdf_path"].name,
+            result["text_path"].name,
+            result["text_length"],
         )
@@ -1,64 +1,384 @@
+import hashlib
+import os
+import re
+import socket
+import ijson
+import orjson
 import requests
 import logging
 import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+from urllib3.connection import HTTPConnection
+from config import config
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
 
+# Attachments whose URL matches this are glossaries, not reports
+_ABBREV_RE = re.compile(r"abbreviations", re.IGNORECASE)
 
-def fetch_report_links(total_reports: int):
-    search_url = "https://www.gov.uk/api/search.json"
-    headers = {"Accept": "application/json"}
-    report_links = []
+# Content type of the report attachments we keep
+PDF_CT = "application/pdf"
+
+# Where the attachments sit in a /api/content response, as an ijson prefix
+ATTACHMENTS_PREFIX = "details.attachments.item"
+
+# Content API bodies are parsed as they stream in, this many bytes at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Retry policy for GOV.UK API requests: capped exponential backoff, plus up
+# to JITTER seconds of random delay. It is the only retry layer; the session's
+# adapter does not retry on its own
+MAX_RETRIES = 5
+BASE_DELAY = 1.0
+MAX_DELAY = 30.0
+JITTER = 0.5
+
+# Client errors that will not go away on retry
+NON_RETRYABLE_STATUS = {400, 401, 403, 404}
+
+# Maximum number of concurrent /api/content requests (threads)
+MAX_CONCURRENT_FETCHES = 16
+
+SEARCH_URL = "https://www.gov.uk/api/search.json"
+
+# Largest page the search API will return
+SEARCH_PAGE_SIZE = 1500
+
+# Headers for every GOV.UK API request. Brotli shrinks the JSON noticeably more
+# than gzip, and requests decodes it when brotli is installed
+API_HEADERS = {"Accept": "application/json", "Accept-Encoding": "br, gzip, deflate"}
+
+# Connection pool sizing for bursts of concurrent requests
+POOL_MAXSIZE = 64
+
+# TCP keepalive, so pooled connections idling between bursts are not silently
+# dropped by NAT or firewalls
+SOCKET_OPTIONS = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections are opened with SOCKET_OPTIONS."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = (
+            HTTPConnection.default_socket_options + SOCKET_OPTIONS
+        )
+        super().init_poolmanager(*args, **kwargs)
+
+
+# Shared session so every call to www.gov.uk reuses the same keep-alive connections.
+# pool_block makes threads beyond POOL_MAXSIZE wait for a free connection rather
+# than open throwaway ones
+_SESSION = requests.Session()
+_SESSION.headers.update(API_HEADERS)
+_SESSION.mount(
+    "https://",
+    _KeepAliveAdapter(
+        pool_connections=4,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=True,
+        max_retries=0,
+    ),
+)
+
+
+def get_session() -> requests.Session:
+    """
+    Return the shared session used for all GOV.UK API requests.
+
+    Callers can customise it (headers, proxies, adapters) before fetching.
+    """
+    return _SESSION
+
+
+def _is_retryable(e: BaseException) -> bool:
+    """Retry transport errors and server-side failures, but not client errors."""
+    if isinstance(e, requests.exceptions.HTTPError):
+        return e.response is None or e.response.status_code not in NON_RETRYABLE_STATUS
+    return isinstance(e, requests.exceptions.RequestException)
+
+
+# Shared by search and content requests
+_api_retry = retry(
+    stop=stop_after_attempt(MAX_RETRIES),
+    wait=wait_exponential_jitter(initial=BASE_DELAY, max=MAX_DELAY, jitter=JITTER),
+    retry=retry_if_exception(_is_retryable),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+
+
+def _search_params(start: int, count: int) -> dict:
+    return {
+        "filter_format": "aaib_report",
+        "order": "-public_timestamp",
+        "start": start,
+        "count": count,
+        # Attachments come back with the search results where the index has
+        # them, which saves a content API request per report
+        "fields": "link,attachments",
+    }
+
+
+@_api_retry
+def _get_search_page(start: int, count: int) -> list[dict]:
+    """Fetch one page of search results."""
+    response = _SESSION.get(SEARCH_URL, params=_search_params(start, count), timeout=30)
+    response.raise_for_status()
+    return orjson.loads(response.content).get("results", [])
+
+
+def fetch_report_links(total_reports: int) -> Iterator[dict]:
+    """
+    Page through the search API, yielding each result as soon as its page arrives.
+
+    Consumers can start working on the first reports while later pages are
+    still being fetched; wrap in list() where all results are needed at once.
+
+    Args:
+        total_reports: Maximum number of reports to yield
+
+    Yields:
+        Search results (dicts with "link" and, where available, "attachments")
+    """
+    # Results shift between pages when a report is published mid-pagination,
+    # so the same report can come back twice
+    seen = set()
     start = 0
-    per_page = min(1500, max(1, total_reports))
-    while len(report_links) < total_reports:
-        count = min(per_page, total_reports - len(report_links))
-        params = {
-            "filter_format": "aaib_report",
-            "order": "-public_timestamp",
-            "start": start,
-            "count": count,
-            "fields": "link",
-        }
-        response = requests.get(search_url, params=params, headers=headers, timeout=30)
-        response.raise_for_status()
-        items = response.json().get("results", [])
-        if not items:
-            break
-        report_links.extend(items)
+    while len(seen) < total_reports:
+        count = min(SEARCH_PAGE_SIZE, total_reports - len(seen))
+        items = _get_search_page(start, count)
         start += len(items)
+        for item in items:
+            if item["link"] in seen:
+                continue
+            seen.add(item["link"])
+            yield item
+            if len(seen) >= total_reports:
+                return
+        # A short page is the last one
         if len(items) < count:
-            break
-    return report_links[:total_reports]
+            return
+
+
+def _content_cache_paths(report_link: str) -> tuple[Path, Path]:
+    """Cache file for a report's attachments, and the file holding its ETag."""
+    key = hashlib.sha1(report_link.encode("utf-8")).hexdigest()
+    cache_dir = Path(config.CONTENT_CACHE_DIR)
+    return cache_dir / f"{key}.attachments.json", cache_dir / f"{key}.etag"
+
+
+def _read_content_cache(
+    report_link: str,
+) -> tuple[list[dict] | None, str | None, bool]:
+    """
+    Look up the cached attachments of a report's /api/content response.
+
+    A cache entry that cannot be parsed is deleted and treated as a miss, so it
+    is fetched again in full rather than revalidated.
+
+    Returns:
+        Tuple of (attachments or None, stored ETag or None, whether they are
+        still fresh)
+    """
+    body_path, etag_path = _content_cache_paths(report_link)
+    try:
+        attachments = orjson.loads(body_path.read_bytes())
+        if not isinstance(attachments, list) or not all(
+            isinstance(a, dict) for a in attachments
+        ):
+            raise ValueError("not a list of attachments")
+        age = time.time() - body_path.stat().st_mtime
+        etag = etag_path.read_text() if etag_path.exists() else None
+    except OSError:
+        return None, None, False
+    except ValueError as e:
+        logger.warning("Discarding bad cache entry for %s: %s", report_link, e)
+        body_path.unlink(missing_ok=True)
+        etag_path.unlink(missing_ok=True)
+        return None, None, False
+    return attachments, etag, age < config.CONTENT_CACHE_TTL
+
+
+def _write_content_cache(report_link: str, body: bytes, etag: str | None) -> None:
+    """Atomically store a report's attachments (and the response ETag) in the cache."""
+    body_path, etag_path = _content_cache_paths(report_link)
+    try:
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = body_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, body_path)
+        if etag:
+            etag_path.write_text(etag)
+        else:
+            etag_path.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("Could not cache content for %s: %s", report_link, e)
+
+
+def _pdf_urls_from_attachments(attachments: list[dict]) -> list[str]:
+    return [
+        url
+        for a in attachments
+        if (url := a.get("url"))
+        and a.get("content_type") == PDF_CT
+        and not _ABBREV_RE.search(url)
+    ]
+
+
+def _search_attachments(report: dict) -> list[dict] | None:
+    """
+    Attachments returned with a search result, if they can be trusted.
+
+    The search index does not always include attachments, or every field of
+    them; an empty list or entries without url or content_type could hide PDFs,
+    so in those cases None is returned and the content API is used instead.
+    """
+    attachments = report.get("attachments")
+    if not attachments or not all(
+        a.get("url") and a.get("content_type") for a in attachments
+    ):
+        return None
+    return attachments
+
+
+def _attachment_parser():
+    """
+    Start an incremental parser for a streamed /api/content body.
+
+    Only the attachment objects are built; the rest of the document (HTML
+    body, links, taxonomy) is scanned past without being materialised.
+
+    Returns:
+        Tuple of (list the attachments are appended to, parser to send() chunks to)
+    """
+    attachments = ijson.sendable_list()
+    return attachments, ijson.items_coro(attachments, ATTACHMENTS_PREFIX)
+
+
+def _project_attachments(attachments: list[dict]) -> list[dict]:
+    """Keep only the attachment fields the PDF filter reads."""
+    return [
+        {"url": a.get("url"), "content_type": a.get("content_type")}
+        for a in attachments
+    ]
+
+
+@_api_retry
+def _get_attachments(
+    content_url: str, headers: dict
+) -> tuple[list[dict], str | None] | None:
+    """Fetch a report's attachments and ETag, or None if the server answered 304."""
+    with _SESSION.get(
+        content_url, headers=headers, stream=True, timeout=30
+    ) as response:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        attachments, parser = _attachment_parser()
+        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+            parser.send(chunk)
+        parser.close()
+    return _project_attachments(attachments), response.headers.get("ETag")
+
+
+def _revalidation_headers(cached: list[dict] | None, etag: str | None) -> dict:
+    return {"If-None-Match": etag} if cached is not None and etag else {}
+
+
+def _pdf_urls_from_response(
+    report_link: str,
+    fetched: tuple[list[dict], str | None] | None,
+    cached: list[dict] | None,
+    etag: str | None,
+) -> list[str]:
+    """Update the content cache with a fetch result and filter its PDF URLs."""
+    if fetched is None:
+        # 304 Not Modified: the cached attachments are still current
+        _write_content_cache(report_link, orjson.dumps(cached), etag)
+        return _pdf_urls_from_attachments(cached)
+    attachments, new_etag = fetched
+    _write_content_cache(report_link, orjson.dumps(attachments), new_etag)
+    return _pdf_urls_from_attachments(attachments)
 
 
 def fetch_pdf_urls(report_link: str):
     content_url = f"https://www.gov.uk/api/content{report_link}"
-    headers = {"Accept": "application/json"}
-    while True:
-        try:
-            response = requests.get(content_url, headers=headers, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            attachments = data.get("details", {}).get("attachments", [])
-            return [
-                a["url"]
-                for a in attachments
-                if a.get("content_type") == "application/pdf"
-                and "abbreviations" not in a["url"].lower()
-            ]
-        except Exception as e:
-            logging.error(
-                f"Error fetching {content_url}: {e}. Retrying in 3 seconds..."
-            )
-            time.sleep(3)
+
+    # Reports rarely change once published: serve fresh cache entries without a
+    # request, and revalidate stale ones with If-None-Match
+    cached, etag, fresh = _read_content_cache(report_link)
+    if fresh:
+        return _pdf_urls_from_attachments(cached)
+
+    fetched = _get_attachments(content_url, _revalidation_headers(cached, etag))
+    return _pdf_urls_from_response(report_link, fetched, cached, etag)
+
+
+def pdf_urls_for_report(report: dict) -> list[str]:
+    """
+    Get the PDF URLs of a search result.
+
+    Uses the attachments returned with the search result when they are complete,
+    and only falls back to the content API for results without them.
+
+    Args:
+        report: Search result as returned by fetch_report_links
+
+    Returns:
+        PDF URLs attached to the report
+    """
+    attachments = _search_attachments(report)
+    if attachments is not None:
+        return _pdf_urls_from_attachments(attachments)
+    return fetch_pdf_urls(report["link"])
+
+
+def _pdf_urls_or_skip(report: dict) -> list[str] | None:
+    try:
+        return pdf_urls_for_report(report)
+    except (requests.exceptions.RequestException, ijson.JSONError, ValueError) as e:
+        logger.error("Giving up on %s: %s", report["link"], e)
+        return None
+
+
+def collect_all_threaded(report_links: Iterable[dict]) -> tuple[list[str], int]:
+    """
+    Fetch the PDF URLs of many reports on a thread pool over the shared session.
+
+    requests releases the GIL while waiting on the socket, and the session's
+    connection pool is larger than the number of workers, so threads never wait
+    on each other for a connection.
+    Passing fetch_report_links() directly starts fetches while it is still paging.
+
+    Args:
+        report_links: Search results, e.g. from fetch_report_links
+
+    Returns:
+        Tuple of (PDF URLs of all reports in report order, number of reports
+        processed); reports that fail are skipped but still counted
+    """
+    pdf_urls = []
+    num_reports = 0
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES) as executor:
+        for urls in executor.map(_pdf_urls_or_skip, report_links):
+            num_reports += 1
+            if urls:
+                pdf_urls.extend(urls)
+    return pdf_urls, num_reports
 
 
 if __name__ == "__main__":
-    pdfs = []
-    for report in fetch_report_links(50):
-        pdf_urls = fetch_pdf_urls(report["link"])
-        pdfs.extend(pdf_urls)
-    logging.info("PDF URLs collected:")
-    for url in pdfs:
-        logging.info(url)
+    pdfs, _ = collect_all_threaded(fetch_report_links(50))
+    logger.info("PDF URLs collected:\n%s", "\n".join(pdfs))